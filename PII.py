@@ -1,12 +1,34 @@
+import functools
 import os
 import json
+import re
 import sys
+import tempfile
+import unicodedata
 import requests
 import ctypes
 import ctypes.wintypes as wintypes
 
-from PyQt5.QtCore import Qt, QEvent
-from PyQt5.QtGui import QIcon, QPalette, QColor, QBrush, QTextDocument
+from PyQt5.QtCore import (
+    Qt,
+    QEvent,
+    QAbstractTableModel,
+    QModelIndex,
+    QRunnable,
+    QThread,
+    QThreadPool,
+    QTimer,
+    pyqtSignal,
+)
+from PyQt5.QtGui import (
+    QIcon,
+    QPalette,
+    QColor,
+    QBrush,
+    QTextCursor,
+    QTextDocument,
+    QTextTableFormat,
+)
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -16,8 +38,8 @@ from PyQt5.QtWidgets import (
     QLineEdit,
     QPushButton,
     QLabel,
-    QTableWidget,
-    QTableWidgetItem,
+    QAbstractItemView,
+    QTableView,
     QMessageBox,
     QComboBox,
     QHeaderView,
@@ -27,6 +49,71 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtPrintSupport import QPrinter
 
 from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+# Optional: orjson parses JSON straight from bytes, several times faster
+# than stdlib json. The app works fine without it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """
+    Decode JSON from bytes (or str), using orjson when available.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """
+    Encode obj as indented JSON bytes, using orjson when available.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def json_dumps_compact(obj):
+    """
+    Encode obj as compact JSON bytes (no indentation or spacing) — for
+    files the app rewrites often, like the inventory.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def atomic_write_json(path, obj, compact=False):
+    """
+    Write obj as JSON to path atomically: serialize to a uniquely named
+    temp file in the target directory, then os.replace() it over the
+    target. A crash mid-write can't truncate the existing file, and
+    because every call gets its own temp file, overlapping writers
+    (a pool-thread flush racing a synchronous save) can't write into
+    each other's file — the last complete write simply wins.
+    """
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".",
+        prefix=os.path.basename(path) + ".",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(json_dumps_compact(obj) if compact else json_dumps(obj))
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
 
 
 # ---------- PATH HELPERS FOR PORTABLE .EXE ----------
@@ -45,6 +132,7 @@ def get_app_dir():
 APP_DIR = get_app_dir()
 INVENTORY_FILE = os.path.join(APP_DIR, "inventory.json")   # saved next to .py/.exe
 SETTINGS_FILE = os.path.join(APP_DIR, "settings.json")     # theme persistence
+CATEGORIES_CACHE_FILE = os.path.join(APP_DIR, "categories_cache.json")  # ETag + payload
 
 
 # ---------- EXE ICON HELPER (USE EMBEDDED ICON) ----------
@@ -133,42 +221,609 @@ def get_app_icon():
     return None
 
 
+# ---------- SEARCH TEXT FOLDING ----------
+
+def fold_search_text(text):
+    """
+    Normalize text for matching: casefold (full Unicode lowercasing)
+    and strip combining accents, so "cafe" finds "Café". Applied to
+    both the name corpus (once, at load) and the typed keywords.
+    """
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+# ---------- SEARCH PATTERN CACHE ----------
+
+@functools.lru_cache(maxsize=64)
+def compile_search_pattern(keywords):
+    """
+    Compile a lowercase keyword tuple into one alternation regex, so a
+    match is a single C-level scan per item name instead of one Python
+    substring check per keyword. Keeps the existing semantics: an item
+    matches if ANY keyword appears in its name.
+    """
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+# ---------- MONEY FORMATTING ----------
+
+@functools.lru_cache(maxsize=16384)
+def fmt_money(value):
+    """
+    Format an aUEC amount with thousands separators. Many items share
+    the same price (stacks, tiers), so repeated amounts become a cache
+    hit instead of re-running number formatting.
+    """
+    return f"{value:,.0f}"
+
+
 # --- API ENDPOINTS ---
 UEX_API_URL = "https://api.uexcorp.uk/2.0/marketplace_averages_all"
 UEX_CATEGORIES_URL = "https://api.uexcorp.uk/2.0/categories"
 
+# Shared HTTP session with keep-alive: the back-to-back startup calls
+# (prices, then categories) reuse one TCP+TLS connection instead of
+# paying a fresh handshake each
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4),
+)
 
-# ---------- SORTING-HELPER ITEM ----------
 
-class NumericTableWidgetItem(QTableWidgetItem):
+# Shared brushes for the Trend column, allocated once instead of per
+# cell paint (safe to build at import: QBrush/QColor need no QApplication)
+TREND_UP_BRUSH = QBrush(QColor(0, 200, 0))     # green ▲
+TREND_DOWN_BRUSH = QBrush(QColor(200, 0, 0))   # red ▼
+
+# Alignment and item-flag combinations used by the model, OR-ed once
+# here instead of on every data()/flags() call for visible cells
+ALIGN_LEFT_VCENTER = Qt.AlignLeft | Qt.AlignVCenter
+ALIGN_RIGHT_VCENTER = Qt.AlignRight | Qt.AlignVCenter
+READONLY_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+EDITABLE_FLAGS = READONLY_FLAGS | Qt.ItemIsEditable
+
+
+# ---------- THEME CONSTANTS ----------
+# The two stylesheets are fixed for the life of the app; build the
+# strings once at import instead of a fresh literal per toggle.
+
+DARK_QSS = """
+    QWidget {
+        background-color: #1e1e1e;
+        color: #f0f0f0;
+    }
+
+    QLineEdit, QComboBox {
+        background-color: #252525;
+        color: #f0f0f0;
+        border: 1px solid #555555;
+    }
+
+    QComboBox QAbstractItemView {
+        background-color: #252525;
+        color: #f0f0f0;
+        selection-background-color: #2a82da;
+        selection-color: #000000;
+    }
+
+    QTableView {
+        background-color: #252525;
+        color: #f0f0f0;
+        gridline-color: #555555;
+        selection-background-color: #2a82da;
+        selection-color: #000000;
+    }
+
+    QHeaderView::section {
+        background-color: #303030;
+        color: #f0f0f0;
+        border: 1px solid #555555;
+    }
+
+    QPushButton {
+        background-color: #3b3b3b;
+        color: #f0f0f0;
+        border: 1px solid #666666;
+        padding: 3px 8px;
+    }
+
+    QPushButton:hover {
+        background-color: #4a4a4a;
+    }
+
+    QPushButton:pressed {
+        background-color: #2f2f2f;
+    }
+"""
+
+LIGHT_QSS = """
+    QWidget {
+        background-color: #f0f0f0;
+        color: #202020;
+    }
+
+    QLineEdit, QComboBox {
+        background-color: #ffffff;
+        color: #202020;
+        border: 1px solid #b0b0b0;
+    }
+
+    QComboBox QAbstractItemView {
+        background-color: #ffffff;
+        color: #202020;
+        selection-background-color: #2a82da;
+        selection-color: #ffffff;
+    }
+
+    QTableView {
+        background-color: #ffffff;
+        color: #202020;
+        gridline-color: #b0b0b0;
+        selection-background-color: #2a82da;
+        selection-color: #ffffff;
+    }
+
+    QHeaderView::section {
+        background-color: #e0e0e0;
+        color: #202020;
+        border: 1px solid #b0b0b0;
+    }
+
+    QPushButton {
+        background-color: #e0e0e0;
+        color: #202020;
+        border: 1px solid #a0a0a0;
+        padding: 3px 8px;
+    }
+
+    QPushButton:hover {
+        background-color: #d0d0d0;
+    }
+
+    QPushButton:pressed {
+        background-color: #c0c0c0;
+    }
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def build_dark_palette():
     """
-    A table item that tries to sort numerically if possible.
-    - For Qty, Listed Price, Sell Price, Line Total columns (numbers with commas or blanks)
-    - Falls back to plain string comparison for non-numeric values
+    Dark background, light text. Built once and reused per apply.
     """
-    def _to_number(self, text):
-        text = text.replace(",", "").strip()
-        if not text:
-            return 0.0
+    palette = QPalette()
+    palette.setColor(QPalette.Window, QColor(30, 30, 30))
+    palette.setColor(QPalette.WindowText, Qt.white)
+    palette.setColor(QPalette.Base, QColor(20, 20, 20))
+    palette.setColor(QPalette.AlternateBase, QColor(45, 45, 45))
+    palette.setColor(QPalette.ToolTipBase, Qt.white)
+    palette.setColor(QPalette.ToolTipText, Qt.white)
+    palette.setColor(QPalette.Text, Qt.white)
+    palette.setColor(QPalette.Button, QColor(45, 45, 45))
+    palette.setColor(QPalette.ButtonText, Qt.white)
+    palette.setColor(QPalette.BrightText, Qt.red)
+    palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
+    palette.setColor(QPalette.HighlightedText, Qt.black)
+    return palette
+
+
+@functools.lru_cache(maxsize=None)
+def build_light_palette():
+    """
+    Light background, dark text (inverse of dark). Built once and reused.
+    """
+    palette = QPalette()
+    palette.setColor(QPalette.Window, Qt.white)
+    palette.setColor(QPalette.WindowText, Qt.black)
+    palette.setColor(QPalette.Base, Qt.white)
+    palette.setColor(QPalette.AlternateBase, QColor(235, 235, 235))
+    palette.setColor(QPalette.ToolTipBase, Qt.black)
+    palette.setColor(QPalette.ToolTipText, Qt.white)
+    palette.setColor(QPalette.Text, Qt.black)
+    palette.setColor(QPalette.Button, QColor(235, 235, 235))
+    palette.setColor(QPalette.ButtonText, Qt.black)
+    palette.setColor(QPalette.BrightText, Qt.red)
+    palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
+    palette.setColor(QPalette.HighlightedText, Qt.white)
+    return palette
+
+
+# ---------- BACKGROUND DATA LOADER ----------
+
+class DataLoadThread(QThread):
+    """
+    Fetches prices and categories off the GUI thread so the window can
+    paint and respond while the HTTP calls run.
+
+    Emits:
+      loaded(market_data, categories_map) on success
+      failed(message) when the price fetch fails
+    """
+    loaded = pyqtSignal(list, dict)
+    failed = pyqtSignal(str)
+
+    def run(self):
         try:
-            return float(text)
-        except ValueError:
-            # If it's not numeric, return None and let caller decide
+            market_data = fetch_market_data()
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+
+        # Categories (Armor, Avionics, etc.) are non-essential: the app
+        # still works without the category filters
+        try:
+            categories = fetch_categories()
+        except Exception as e:
+            print(f"Warning: failed to load categories: {e}")
+            categories = {}
+
+        self.loaded.emit(market_data, categories)
+
+
+class InventorySaveTask(QRunnable):
+    """
+    Writes an inventory snapshot to disk on a pool thread so the GUI
+    thread never blocks on serialization or file I/O. The snapshot is
+    taken before scheduling, so later edits can't race the write, and
+    save_inventory replaces the file atomically.
+    """
+
+    def __init__(self, snapshot):
+        super().__init__()
+        self.snapshot = snapshot
+
+    def run(self):
+        save_inventory(INVENTORY_FILE, self.snapshot)
+
+
+class ImportThread(QThread):
+    """
+    Parses an exported index file and matches its records against the
+    current market data off the GUI thread, so large files never freeze
+    the window (and no processEvents re-entrancy is needed).
+
+    Emits:
+      parsed(matched, not_found) — matched is a list of
+        (key, qty, sell_price_or_None) tuples ready to merge
+      failed(message) when reading or parsing the file fails
+    """
+    parsed = pyqtSignal(list, list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, ext, name_to_index, item_keys, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.ext = ext
+        self.name_to_index = name_to_index
+        self.item_keys = item_keys
+
+    def run(self):
+        try:
+            records = self._read_records()
+            matched, not_found = self._match_records(records)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.parsed.emit(matched, not_found)
+
+    def _read_records(self):
+        """
+        Read the file into normalized {"Item Name", "QTY", "Sell Value"}
+        dicts (flexible key matching for JSON, header mapping for XLSX).
+        """
+        records = []
+
+        if self.ext == ".json":
+            with open(self.file_path, "rb") as f:
+                data = json_loads(f.read())
+            if not isinstance(data, list):
+                raise ValueError("JSON must be a list of objects.")
+            for rec in data:
+                if not isinstance(rec, dict):
+                    continue
+                name = (
+                    rec.get("Item Name")
+                    or rec.get("item_name")
+                    or rec.get("name")
+                )
+                qty = (
+                    rec.get("QTY")
+                    if "QTY" in rec else rec.get("qty", 0)
+                )
+                sell_val = (
+                    rec.get("Sell Value")
+                    if "Sell Value" in rec
+                    else rec.get("Sell Price", rec.get("sell_price"))
+                )
+                records.append({
+                    "Item Name": name,
+                    "QTY": qty,
+                    "Sell Value": sell_val,
+                })
+
+        else:  # .xlsx
+            # Read-only mode streams rows out of the zip instead of
+            # building the full in-memory cell graph (mirror of the
+            # write-only export). Must be closed explicitly.
+            wb = load_workbook(self.file_path, read_only=True, data_only=True)
+            try:
+                ws = wb.active
+
+                # Read header row and map columns
+                header_map = {}
+                first = True
+                for row in ws.iter_rows(values_only=True):
+                    if first:
+                        first = False
+                        if not row:
+                            continue
+                        for idx, val in enumerate(row):
+                            if not val:
+                                continue
+                            header_map[str(val).strip().lower()] = idx
+                        continue
+
+                    if not row:
+                        continue
+
+                    def get_col(*names):
+                        for n in names:
+                            idx = header_map.get(n)
+                            if idx is not None and idx < len(row):
+                                return row[idx]
+                        return None
+
+                    records.append({
+                        "Item Name": get_col("item name", "name"),
+                        "QTY": get_col("qty", "quantity"),
+                        "Sell Value": get_col("sell value", "sell price"),
+                    })
+            finally:
+                wb.close()
+
+        return records
+
+    def _match_records(self, records):
+        """
+        Resolve each record to an inventory key and parse its values.
+        Returns (matched, not_found): matched as (key, qty, sell_price)
+        tuples — sell_price None means "clear" — and not_found as the
+        item names with no match in the current market data.
+        """
+        matched = []
+        not_found = []
+        name_to_index = self.name_to_index
+        item_keys = self.item_keys
+
+        for rec in records:
+            name = rec.get("Item Name")
+            if not name:
+                continue
+
+            pos = name_to_index.get(name)
+            if pos is None:
+                not_found.append(name)
+                continue
+
+            qty_raw = rec.get("QTY", 0)
+            try:
+                qty_val = float(qty_raw) if qty_raw is not None else 0.0
+            except (TypeError, ValueError):
+                qty_val = 0.0
+
+            sell_raw = rec.get("Sell Value")
+            if sell_raw in (None, ""):
+                sell_val = None
+            else:
+                try:
+                    sell_val = float(sell_raw)
+                except (TypeError, ValueError):
+                    sell_val = sell_raw
+
+            matched.append((item_keys[pos], qty_val, sell_val))
+
+        return matched, not_found
+
+
+# ---------- TABLE MODEL ----------
+
+class InventoryModel(QAbstractTableModel):
+    """
+    Table model backed directly by the window's market data, parallel
+    arrays and filtered_indices. The view only queries visible cells,
+    so no per-cell item objects are allocated no matter how many rows
+    the current filter produces.
+
+    Columns: Qty | Item Name | Listed Price | Trend | Sell Price | Line Total
+    """
+
+    COL_QTY = 0
+    COL_NAME = 1
+    COL_PRICE = 2
+    COL_TREND = 3
+    COL_SELL = 4
+    COL_TOTAL = 5
+
+    HEADERS = [
+        "Qty",
+        "Item Name",
+        "Listed Price (aUEC)",
+        "Trend",
+        "Sell Price (aUEC)",
+        "Line Total (aUEC)",
+    ]
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.win = window
+
+    # ----- structure -----
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.win.filtered_indices)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if index.column() in (self.COL_QTY, self.COL_SELL):
+            return EDITABLE_FLAGS
+        return READONLY_FLAGS
+
+    # ----- cell values -----
+    def _item_index(self, row):
+        return self.win.filtered_indices[row]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
             return None
 
-    def __lt__(self, other):
-        if not isinstance(other, QTableWidgetItem):
-            return super().__lt__(other)
+        row = index.row()
+        if row < 0 or row >= len(self.win.filtered_indices):
+            return None
 
-        self_num = self._to_number(self.text())
-        other_num = self._to_number(other.text())
+        i = self._item_index(row)
+        col = index.column()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._display_text(i, col)
+
+        if role == Qt.TextAlignmentRole:
+            if col in (self.COL_QTY, self.COL_TREND):
+                return Qt.AlignCenter
+            if col == self.COL_NAME:
+                return ALIGN_LEFT_VCENTER
+            return ALIGN_RIGHT_VCENTER
+
+        if role == Qt.ForegroundRole and col == self.COL_TREND:
+            arrow = self.win.trend[i]
+            if arrow == "▲":
+                return TREND_UP_BRUSH
+            if arrow == "▼":
+                return TREND_DOWN_BRUSH
+            return None
 
-        # If both are numeric, compare numerically
-        if self_num is not None and other_num is not None:
-            return self_num < other_num
+        return None
 
-        # Otherwise, fall back to string comparison (useful for Item Name)
-        return self.text().lower() < other.text().lower()
+    def _display_text(self, i, col):
+        win = self.win
+        item = win.market_data[i]
+
+        if col == self.COL_QTY:
+            qty = win.qty_by_pos[i]
+            # Reduced resolution: 17.0 -> 17, 0 -> ""
+            if qty == 0:
+                return ""
+            if float(qty).is_integer():
+                return str(int(qty))
+            return str(qty)
+
+        if col == self.COL_NAME:
+            return item.get("item_name") or f"Item {item.get('id_item')}"
+
+        if col == self.COL_PRICE:
+            return win.price_texts[i]
+
+        if col == self.COL_TREND:
+            return win.trend[i]
+
+        if col == self.COL_SELL:
+            sell_val = win.sell_by_pos[i]
+            if isinstance(sell_val, (int, float)):
+                # For money: blank if 0 or negative
+                return fmt_money(sell_val) if sell_val > 0 else ""
+            return "" if sell_val in ("", None) else str(sell_val)
+
+        if col == self.COL_TOTAL:
+            line_total = win.qty_by_pos[i] * win.unit_prices[i]
+            return fmt_money(line_total) if line_total else ""
+
+        return ""
+
+    # ----- editing -----
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+
+        row = index.row()
+        if row < 0 or row >= len(self.win.filtered_indices):
+            return False
+
+        i = self._item_index(row)
+        key = self.win.item_keys[i]
+        col = index.column()
+        text = "" if value is None else str(value)
+
+        if col == self.COL_QTY:
+            self.win.set_qty_from_text(key, text)
+            # Qty affects the Line Total cell too
+            self.dataChanged.emit(
+                self.index(row, self.COL_QTY),
+                self.index(row, self.COL_TOTAL),
+                [Qt.DisplayRole, Qt.EditRole],
+            )
+            self.win.update_grand_total()
+            self.win.update_overall_total()
+            return True
+
+        if col == self.COL_SELL:
+            self.win.set_sell_price_from_text(key, text)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+            self.win.update_grand_total()
+            return True
+
+        return False
+
+    # ----- sorting -----
+    def _sort_key(self, col):
+        win = self.win
+
+        if col == self.COL_QTY:
+            return win.qty_by_pos.__getitem__
+        if col == self.COL_NAME:
+            return win.name_rank.__getitem__
+        if col == self.COL_PRICE:
+            return lambda i: win.unit_prices[i]
+        if col == self.COL_TREND:
+            return lambda i: win.trend[i]
+        if col == self.COL_SELL:
+            def sell_key(i):
+                val = win.sell_by_pos[i]
+                # Numeric prices group together (blank counts as 0);
+                # free-form string labels sort after them, alphabetically
+                if isinstance(val, (int, float)):
+                    return (0, val, "")
+                return (1, 0.0, str(val).lower())
+            return sell_key
+        # Line Total
+        return lambda i: win.qty_by_pos[i] * win.unit_prices[i]
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if not self.win.filtered_indices:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self.win.filtered_indices.sort(
+            key=self._sort_key(column),
+            reverse=(order == Qt.DescendingOrder),
+        )
+        self.layoutChanged.emit()
+
+    def refresh(self):
+        """
+        Tell views the whole row set changed (after a filter/data reload).
+        """
+        self.beginResetModel()
+        self.endResetModel()
 
 
 def fetch_market_data():
@@ -176,9 +831,11 @@ def fetch_market_data():
     Fetch marketplace 30-day averages for all items from UEX.
     Returns a list of dicts or raises an exception on error.
     """
-    resp = requests.get(UEX_API_URL, timeout=15)
+    resp = _SESSION.get(UEX_API_URL, timeout=15)
     resp.raise_for_status()
-    data = resp.json()
+    # Decode from the raw bytes: skips requests' charset detection and
+    # the str round-trip that resp.json() goes through
+    data = json_loads(resp.content)
 
     if not isinstance(data, dict) or data.get("status") != "ok":
         raise RuntimeError(f"Unexpected API response: {data!r}")
@@ -186,15 +843,62 @@ def fetch_market_data():
     return data.get("data", [])
 
 
+def _read_categories_cache():
+    """
+    Load the cached categories payload from disk.
+    Returns (etag, payload) or (None, None) if missing/corrupted.
+    """
+    try:
+        with open(CATEGORIES_CACHE_FILE, "rb") as f:
+            cached = json_loads(f.read())
+        if isinstance(cached, dict) and "data" in cached:
+            return cached.get("etag"), cached["data"]
+    except Exception:
+        pass
+    return None, None
+
+
+def _write_categories_cache(etag, payload):
+    """
+    Persist the categories payload + ETag next to the app.
+    Cache-write failures are non-fatal (we just refetch next time).
+    """
+    try:
+        with open(CATEGORIES_CACHE_FILE, "wb") as f:
+            f.write(json_dumps({"etag": etag, "data": payload}))
+    except Exception:
+        pass
+
+
 def fetch_categories():
     """
     Fetch item/service/contract categories and return a mapping:
         { id_category (int): {"section": str, "name": str} }
     We only care about type == "item".
+
+    Categories change rarely, so the raw payload is cached on disk with
+    its ETag. The request revalidates via If-None-Match; a 304 — or a
+    network failure — is served from the cache instead of re-downloading.
     """
-    resp = requests.get(UEX_CATEGORIES_URL, timeout=15)
-    resp.raise_for_status()
-    data = resp.json()
+    etag, cached_payload = _read_categories_cache()
+
+    headers = {}
+    if etag and cached_payload is not None:
+        headers["If-None-Match"] = etag
+
+    try:
+        resp = _SESSION.get(UEX_CATEGORIES_URL, timeout=15, headers=headers)
+        if resp.status_code == 304 and cached_payload is not None:
+            data = cached_payload
+        else:
+            resp.raise_for_status()
+            data = json_loads(resp.content)
+            _write_categories_cache(resp.headers.get("ETag"), data)
+    except requests.RequestException:
+        # Offline or server trouble: fall back to the last good payload
+        if cached_payload is None:
+            raise
+        data = cached_payload
 
     if not isinstance(data, dict) or data.get("status") != "ok":
         raise RuntimeError(f"Unexpected categories API response: {data!r}")
@@ -233,19 +937,20 @@ def load_inventory(path):
     if not os.path.exists(path):
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return json_loads(f.read())
     except Exception:
         return {}
 
 
 def save_inventory(path, inventory_dict):
     """
-    Save inventory (qty + sell_price) to JSON.
+    Save inventory (qty + sell_price) to JSON, atomically. Written
+    compact: this file is rewritten on every (debounced) edit, so the
+    smallest encode wins over pretty-printing.
     """
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(inventory_dict, f, indent=2)
+        atomic_write_json(path, inventory_dict, compact=True)
     except Exception as e:
         print(f"Failed to save inventory: {e}")
 
@@ -259,19 +964,18 @@ def load_settings(path):
     if not os.path.exists(path):
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return json_loads(f.read())
     except Exception:
         return {}
 
 
 def save_settings(path, settings_dict):
     """
-    Save app settings (e.g., theme) to JSON.
+    Save app settings (e.g., theme) to JSON, atomically.
     """
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(settings_dict, f, indent=2)
+        atomic_write_json(path, settings_dict)
     except Exception as e:
         print(f"Failed to save settings: {e}")
 
@@ -290,12 +994,41 @@ class AnnexWindow(QMainWindow):
 
         # Data
         self.market_data = []         # full list from API
-        self.filtered_data = []       # what is currently displayed
-        self.inventory = load_inventory(INVENTORY_FILE)  # {item_key: qty or {qty, sell_price}}
+        # Parallel arrays indexed by position in market_data (SoA layout,
+        # avoids mutating every item dict after fetch)
+        self.cat_section = []         # category section per item ("Armor", ...)
+        self.cat_name = []            # subcategory name per item ("Arms", ...)
+        self.trend = []               # trend arrow per item ("▲"/"▼"/"→")
+        self.unit_prices = []         # listed price per item, as float
+        self.price_texts = []         # listed price per item, pre-formatted
+        self.item_names_lower = []    # folded item_name per item (search corpus)
+        self.name_rank = []           # alphabetical rank per item (sort key)
+        self.item_keys = []           # inventory key per item (see item_key())
+        self.key_to_index = {}        # inventory key -> position in market_data
+        self.name_to_index = {}       # item_name -> position (import matching)
+        self.inventory_indices = set()  # positions with qty > 0 (Inventory filter)
+        self.qty_by_pos = []          # quantity per position (0.0 when not owned)
+        self.sell_by_pos = []         # sell price per position ("" when unset)
+        self.filtered_indices = []    # positions into market_data currently displayed
+        self._last_filter = None      # (keywords, mode, cat, subcat, result) for refinement reuse
+        self.inventory = load_inventory(INVENTORY_FILE)  # {item_key: {qty, sell_price}}
+        self._normalize_inventory()   # also builds _qty_cache / _sell_cache
+
+        # Debounced persistence: cell edits mark the inventory dirty and a
+        # short timer batches the rewrites, so bulk edits don't pay one
+        # full-file serialization per cell
+        self._inventory_dirty = False
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(500)
+        self._flush_timer.timeout.connect(self._flush_inventory)
         self.categories = {}          # {id_category: {"section": ..., "name": ...}}
         self.category_map = {}        # {"Armor": set(["Arms", "Backpacks", ...]), ...}
-        self.updating_table = False   # guard for itemChanged recursion
-
+        self._section_positions = {}  # {section: set(positions)}
+        self._subcat_positions = {}   # {subcategory: set(positions)}
+        self._sorted_sections = []    # category sections, pre-sorted for combos
+        self._sorted_subcats = {}     # {section: sorted subcategory names}
+        self._all_subcats_sorted = [] # union of all subcategories, sorted
         self._central_widget = None   # for wheel event routing
 
         # Theme settings (load last used)
@@ -304,6 +1037,7 @@ class AnnexWindow(QMainWindow):
             self.settings = {}
         theme = self.settings.get("theme", "dark")
         self.dark_mode = (theme != "light")   # default to dark if missing/invalid
+        self._applied_theme = None            # which theme is live on the QApplication
         self.theme_button = None
 
         # UI
@@ -324,75 +1058,15 @@ class AnnexWindow(QMainWindow):
         if not app:
             return
 
-        palette = QPalette()
-        # Dark background, light text
-        palette.setColor(QPalette.Window, QColor(30, 30, 30))
-        palette.setColor(QPalette.WindowText, Qt.white)
-        palette.setColor(QPalette.Base, QColor(20, 20, 20))
-        palette.setColor(QPalette.AlternateBase, QColor(45, 45, 45))
-        palette.setColor(QPalette.ToolTipBase, Qt.white)
-        palette.setColor(QPalette.ToolTipText, Qt.white)
-        palette.setColor(QPalette.Text, Qt.white)
-        palette.setColor(QPalette.Button, QColor(45, 45, 45))
-        palette.setColor(QPalette.ButtonText, Qt.white)
-        palette.setColor(QPalette.BrightText, Qt.red)
-        palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
-        palette.setColor(QPalette.HighlightedText, Qt.black)
-
-        app.setPalette(palette)
+        # Skip the full widget re-polish if dark is already applied
+        if self._applied_theme == "dark":
+            return
 
+        app.setPalette(build_dark_palette())
         # Dark styles for widgets, buttons, filters, and table
-        app.setStyleSheet(
-            """
-            QWidget {
-                background-color: #1e1e1e;
-                color: #f0f0f0;
-            }
-
-            QLineEdit, QComboBox {
-                background-color: #252525;
-                color: #f0f0f0;
-                border: 1px solid #555555;
-            }
-
-            QComboBox QAbstractItemView {
-                background-color: #252525;
-                color: #f0f0f0;
-                selection-background-color: #2a82da;
-                selection-color: #000000;
-            }
-
-            QTableWidget {
-                background-color: #252525;
-                color: #f0f0f0;
-                gridline-color: #555555;
-                selection-background-color: #2a82da;
-                selection-color: #000000;
-            }
-
-            QHeaderView::section {
-                background-color: #303030;
-                color: #f0f0f0;
-                border: 1px solid #555555;
-            }
-
-            QPushButton {
-                background-color: #3b3b3b;
-                color: #f0f0f0;
-                border: 1px solid #666666;
-                padding: 3px 8px;
-            }
-
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-
-            QPushButton:pressed {
-                background-color: #2f2f2f;
-            }
-            """
-        )
+        app.setStyleSheet(DARK_QSS)
 
+        self._applied_theme = "dark"
         self.dark_mode = True
         if self.theme_button:
             # When in dark mode, button offers to switch to Light
@@ -403,75 +1077,15 @@ class AnnexWindow(QMainWindow):
         if not app:
             return
 
-        palette = QPalette()
-        # Light background, dark text (inverse of dark)
-        palette.setColor(QPalette.Window, Qt.white)
-        palette.setColor(QPalette.WindowText, Qt.black)
-        palette.setColor(QPalette.Base, Qt.white)
-        palette.setColor(QPalette.AlternateBase, QColor(235, 235, 235))
-        palette.setColor(QPalette.ToolTipBase, Qt.black)
-        palette.setColor(QPalette.ToolTipText, Qt.white)
-        palette.setColor(QPalette.Text, Qt.black)
-        palette.setColor(QPalette.Button, QColor(235, 235, 235))
-        palette.setColor(QPalette.ButtonText, Qt.black)
-        palette.setColor(QPalette.BrightText, Qt.red)
-        palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
-        palette.setColor(QPalette.HighlightedText, Qt.white)
-
-        app.setPalette(palette)
+        # Skip the full widget re-polish if light is already applied
+        if self._applied_theme == "light":
+            return
 
+        app.setPalette(build_light_palette())
         # Light styles: inverse of dark theme
-        app.setStyleSheet(
-            """
-            QWidget {
-                background-color: #f0f0f0;
-                color: #202020;
-            }
-
-            QLineEdit, QComboBox {
-                background-color: #ffffff;
-                color: #202020;
-                border: 1px solid #b0b0b0;
-            }
-
-            QComboBox QAbstractItemView {
-                background-color: #ffffff;
-                color: #202020;
-                selection-background-color: #2a82da;
-                selection-color: #ffffff;
-            }
-
-            QTableWidget {
-                background-color: #ffffff;
-                color: #202020;
-                gridline-color: #b0b0b0;
-                selection-background-color: #2a82da;
-                selection-color: #ffffff;
-            }
-
-            QHeaderView::section {
-                background-color: #e0e0e0;
-                color: #202020;
-                border: 1px solid #b0b0b0;
-            }
-
-            QPushButton {
-                background-color: #e0e0e0;
-                color: #202020;
-                border: 1px solid #a0a0a0;
-                padding: 3px 8px;
-            }
-
-            QPushButton:hover {
-                background-color: #d0d0d0;
-            }
-
-            QPushButton:pressed {
-                background-color: #c0c0c0;
-            }
-            """
-        )
+        app.setStyleSheet(LIGHT_QSS)
 
+        self._applied_theme = "light"
         self.dark_mode = False
         if self.theme_button:
             # When in light mode, button offers to switch to Dark
@@ -584,8 +1198,14 @@ class AnnexWindow(QMainWindow):
         self.search_edit.setPlaceholderText(
             "Search by partial name (space or comma separated)…"
         )
-        # Live search as you type
-        self.search_edit.textChanged.connect(self.apply_filters)
+        # Live search as you type, debounced so fast typing runs the
+        # filter pipeline once instead of once per keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self.apply_filters)
+        self.search_edit.textChanged.connect(self._search_timer.start)
+        # Enter still filters immediately
         self.search_edit.returnPressed.connect(self.apply_filters)
         search_layout.addWidget(self.search_edit)
 
@@ -598,36 +1218,32 @@ class AnnexWindow(QMainWindow):
         self.status_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         search_layout.addWidget(self.status_label)
 
-        # Table
-        self.table = QTableWidget()
-        # Qty, Item Name, Listed Price, Trend, Sell Price, Line Total
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(
-            [
-                "Qty",
-                "Item Name",
-                "Listed Price (aUEC)",
-                "Trend",
-                "Sell Price (aUEC)",
-                "Line Total (aUEC)",
-            ]
-        )
+        # Table: virtualized view over InventoryModel (no per-cell items)
+        self.table = QTableView()
+        self.model = InventoryModel(self)
+        self.table.setModel(self.model)
 
         # Make "Item Name" the largest/stretch column
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # Qty
-        header.setSectionResizeMode(1, QHeaderView.Stretch)           # Item Name
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Listed Price
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Trend
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Sell Price
-        header.setSectionResizeMode(5, QHeaderView.ResizeToContents)  # Line Total
+        header.setSectionResizeMode(InventoryModel.COL_QTY, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(InventoryModel.COL_NAME, QHeaderView.Stretch)
+        header.setSectionResizeMode(InventoryModel.COL_PRICE, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(InventoryModel.COL_TREND, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(InventoryModel.COL_SELL, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(InventoryModel.COL_TOTAL, QHeaderView.ResizeToContents)
 
         # Enable click-to-sort on headers
         self.table.setSortingEnabled(True)
 
-        self.table.verticalHeader().setVisible(False)
-        self.table.setEditTriggers(QTableWidget.AllEditTriggers)
-        self.table.itemChanged.connect(self.on_item_changed)
+        # Uniform row heights: no word wrap, and Fixed resize mode makes
+        # every row the default section size, so the view never has to
+        # measure rows one by one after a repopulate
+        self.table.setWordWrap(False)
+        vheader = self.table.verticalHeader()
+        vheader.setVisible(False)
+        vheader.setSectionResizeMode(QHeaderView.Fixed)
+
+        self.table.setEditTriggers(QAbstractItemView.AllEditTriggers)
         main_layout.addWidget(self.table)
 
         # Bottom area: buttons + totals
@@ -691,22 +1307,60 @@ class AnnexWindow(QMainWindow):
 
     # ---------------- DATA LOADING ----------------
     def load_data(self):
-        try:
-            self.status_label.setText("Contacting UEX API…")
-            QApplication.processEvents()
-
-            # Prices
-            self.market_data = fetch_market_data()
-
-            # Categories (Armor, Avionics, etc.) and subcategories (Arms, Backpacks, etc.)
-            try:
-                self.categories = fetch_categories()
-            except Exception as e:
-                print(f"Warning: failed to load categories: {e}")
-                self.categories = {}
+        """
+        Start the UEX fetch on a worker thread. The window stays
+        responsive (paints, theme toggle, etc.) while the two HTTP
+        calls run; _on_data_loaded attaches the results on the GUI
+        thread.
+        """
+        self.status_label.setText("Contacting UEX API…")
+        self._load_thread = DataLoadThread(self)
+        self._load_thread.loaded.connect(self._on_data_loaded)
+        self._load_thread.failed.connect(self._on_data_failed)
+        self._load_thread.start()
 
-            # Attach category labels to each item using id_category
-            for item in self.market_data:
+    def _on_data_loaded(self, market_data, categories):
+        try:
+            self.market_data = market_data
+            self.categories = categories
+
+            # ---------- PER-ITEM PARALLEL ARRAYS (single fused pass) ----------
+            # Category labels (from id_category) and trend arrows are stored
+            # in parallel lists indexed by item position, instead of being
+            # written back into each item dict.
+            #
+            # Trend compares the 30-day average buy/sell from UEX:
+            #   ▲ if price_sell > price_buy
+            #   ▼ if price_sell < price_buy
+            #   → otherwise (equal, or missing data)
+            n = len(self.market_data)
+            self.cat_section = [""] * n
+            self.cat_name = [""] * n
+            self.trend = ["→"] * n
+            self.unit_prices = [0.0] * n
+            self.price_texts = ["0"] * n
+            # Search corpus and inventory keys, computed once instead of on
+            # every keystroke / per-row lookup
+            self.item_names_lower = [
+                fold_search_text(it.get("item_name") or "")
+                for it in self.market_data
+            ]
+            self.item_keys = [self.item_key(it) for it in self.market_data]
+            self.key_to_index = {k: i for i, k in enumerate(self.item_keys)}
+            self.name_to_index = {
+                it["item_name"]: i
+                for i, it in enumerate(self.market_data)
+                if it.get("item_name")
+            }
+            # Alphabetical rank per position, computed once: sorting a
+            # filter result then compares small ints instead of strings
+            order = sorted(range(n), key=self.item_names_lower.__getitem__)
+            self.name_rank = [0] * n
+            for rank, i in enumerate(order):
+                self.name_rank[i] = rank
+            self._rebuild_inventory_indices()
+
+            for i, item in enumerate(self.market_data):
                 cat_id = item.get("id_category")
                 try:
                     cat_id_int = int(cat_id) if cat_id is not None else None
@@ -715,18 +1369,9 @@ class AnnexWindow(QMainWindow):
 
                 cat_info = self.categories.get(cat_id_int)
                 if cat_info:
-                    item["category_section"] = (cat_info.get("section") or "").strip()
-                    item["category_name"] = (cat_info.get("name") or "").strip()
-                else:
-                    item["category_section"] = ""
-                    item["category_name"] = ""
+                    self.cat_section[i] = (cat_info.get("section") or "").strip()
+                    self.cat_name[i] = (cat_info.get("name") or "").strip()
 
-            # ---------- TREND ARROWS (price_sell vs price_buy) ----------
-            # UEX gives 30-day average buy/sell. We compare those:
-            #   ▲ if price_sell > price_buy
-            #   ▼ if price_sell < price_buy
-            #   → otherwise (equal, or missing data)
-            for item in self.market_data:
                 price_sell = item.get("price_sell")
                 price_buy = item.get("price_buy")
 
@@ -740,14 +1385,21 @@ class AnnexWindow(QMainWindow):
                 except (TypeError, ValueError):
                     pb = None
 
-                trend_arrow = "→"
                 if ps is not None and pb is not None:
                     if ps > pb:
-                        trend_arrow = "▲"
+                        self.trend[i] = "▲"
                     elif ps < pb:
-                        trend_arrow = "▼"
-
-                item["trend_arrow"] = trend_arrow
+                        self.trend[i] = "▼"
+
+                # Listed price: prefer price_sell, fallback to price_buy
+                # (computed once here; everything reads unit_prices)
+                if ps is not None:
+                    self.unit_prices[i] = ps
+                elif pb is not None:
+                    self.unit_prices[i] = pb
+                # Prices are stable for the session, so format once here
+                # instead of on every table refresh
+                self.price_texts[i] = fmt_money(self.unit_prices[i])
 
             # Build the category / subcategory dropdowns
             self.populate_category_filters()
@@ -757,31 +1409,56 @@ class AnnexWindow(QMainWindow):
             self.apply_filters()
             self.update_overall_total()
         except Exception as e:
-            self.status_label.setText("Failed to load data from UEX.")
-            QMessageBox.critical(self, "Error", f"Error fetching UEX data:\n{e}")
+            self._on_data_failed(str(e))
+
+    def _on_data_failed(self, message):
+        self.status_label.setText("Failed to load data from UEX.")
+        QMessageBox.critical(self, "Error", f"Error fetching UEX data:\n{message}")
 
     # ---------------- CATEGORY FILTER SETUP ----------------
     def populate_category_filters(self):
         """
-        Build:
+        Build the category structures once per data load and fill the
+        combos:
           - self.category_map: {section: set(subcategory_names)}
-          - fill category_combo and subcategory_combo.
+          - self._section_positions: {section: set(positions)}
+          - self._subcat_positions: {subcategory: set(positions)}
+          - self._sorted_sections: sections, pre-sorted
+          - self._sorted_subcats: {section: sorted subcategory names}
+          - self._all_subcats_sorted: union of all subcategories, sorted
+        populate_subcategories only reads the pre-sorted lists, so a
+        category change never rescans market_data or re-sorts, and
+        apply_filters intersects the position sets instead of comparing
+        section strings per item.
         """
         self.category_map = {}
-        for item in self.market_data:
-            section = (item.get("category_section") or "").strip()
-            name = (item.get("category_name") or "").strip()
+        self._section_positions = {}
+        self._subcat_positions = {}
+        for i in range(len(self.market_data)):
+            section = self.cat_section[i]
+            name = self.cat_name[i]
             if not section:
                 continue
             self.category_map.setdefault(section, set())
+            self._section_positions.setdefault(section, set()).add(i)
             if name:
                 self.category_map[section].add(name)
+                self._subcat_positions.setdefault(name, set()).add(i)
+
+        self._sorted_sections = sorted(self.category_map.keys())
+        self._sorted_subcats = {
+            section: sorted(subs) for section, subs in self.category_map.items()
+        }
+        all_subs = set()
+        for subs in self.category_map.values():
+            all_subs.update(subs)
+        self._all_subcats_sorted = sorted(all_subs)
 
         # Populate Category combo
         self.category_combo.blockSignals(True)
         self.category_combo.clear()
         self.category_combo.addItem("All Categories", None)
-        for section in sorted(self.category_map.keys()):
+        for section in self._sorted_sections:
             self.category_combo.addItem(section, section)
         self.category_combo.blockSignals(False)
 
@@ -790,7 +1467,8 @@ class AnnexWindow(QMainWindow):
 
     def populate_subcategories(self):
         """
-        Fill subcategory combo based on current category selection.
+        Fill subcategory combo based on current category selection,
+        from the pre-sorted lists built in populate_category_filters.
         """
         self.subcategory_combo.blockSignals(True)
         self.subcategory_combo.clear()
@@ -800,14 +1478,12 @@ class AnnexWindow(QMainWindow):
 
         if selected_section is None:
             # All categories: show union of all subcategories
-            all_subs = set()
-            for subs in self.category_map.values():
-                all_subs.update(subs)
-            for name in sorted(all_subs):
-                self.subcategory_combo.addItem(name, name)
+            names = self._all_subcats_sorted
         else:
-            for name in sorted(self.category_map.get(selected_section, [])):
-                self.subcategory_combo.addItem(name, name)
+            names = self._sorted_subcats.get(selected_section, [])
+
+        for name in names:
+            self.subcategory_combo.addItem(name, name)
 
         self.subcategory_combo.blockSignals(False)
 
@@ -819,18 +1495,6 @@ class AnnexWindow(QMainWindow):
         self.apply_filters()
 
     # ---------------- HELPERS ----------------
-    def get_unit_price(self, item):
-        """
-        Decide Listed Price for an item: prefer price_sell, fallback to price_buy.
-        """
-        price_sell = item.get("price_sell")
-        price_buy = item.get("price_buy")
-        if price_sell is not None:
-            return float(price_sell)
-        if price_buy is not None:
-            return float(price_buy)
-        return 0.0
-
     def item_key(self, item):
         """
         Unique-ish key per item for inventory persistence.
@@ -845,36 +1509,94 @@ class AnnexWindow(QMainWindow):
 
     def get_qty(self, key):
         """
-        Get quantity for an item key from self.inventory, handling both old and new formats.
+        Get quantity for an item key. Served from the flat cache built by
+        _normalize_inventory; returns 0.0 when not in inventory.
         """
-        val = self.inventory.get(key)
-        if isinstance(val, dict):
-            val = val.get("qty", 0)
-        if val is None:
-            return 0.0
-        try:
-            return float(val)
-        except (TypeError, ValueError):
-            return 0.0
+        return self._qty_cache.get(key, 0.0)
 
     def get_sell_price_for_key(self, key):
         """
-        Get stored Sell Price for an item key from self.inventory.
+        Get stored Sell Price for an item key.
         Returns:
           - float if numeric
           - string if non-numeric
           - "" if not set
         """
-        val = self.inventory.get(key)
-        if not isinstance(val, dict):
-            return ""
-        sp = val.get("sell_price")
-        if sp in (None, ""):
-            return ""
-        try:
-            return float(sp)
-        except (TypeError, ValueError):
-            return sp
+        return self._sell_cache.get(key, "")
+
+    def _normalize_inventory(self):
+        """
+        Migrate self.inventory to the dict-per-entry format in place
+        (old saves stored a bare number per key) and rebuild the flat
+        qty / sell-price caches that the hot paths read. After this, a
+        record is always {"qty": float} with an optional "sell_price"
+        that is either a float or a free-form string.
+        """
+        normalized = {}
+        self._qty_cache = {}
+        self._sell_cache = {}
+        migrated = False
+
+        for key, val in self.inventory.items():
+            if isinstance(val, dict):
+                rec = dict(val)
+            else:
+                rec = {"qty": val}
+                migrated = True
+
+            try:
+                qty = float(rec.get("qty") or 0)
+            except (TypeError, ValueError):
+                qty = 0.0
+            rec["qty"] = qty
+
+            sp = rec.get("sell_price")
+            if sp in (None, ""):
+                rec.pop("sell_price", None)
+            else:
+                try:
+                    sp = float(sp)
+                except (TypeError, ValueError):
+                    pass  # keep free-form strings as-is
+                rec["sell_price"] = sp
+                self._sell_cache[key] = sp
+
+            if qty:
+                self._qty_cache[key] = qty
+            normalized[key] = rec
+
+        self.inventory = normalized
+
+        # Persist migrated old-style saves so normalization is one-time
+        if migrated:
+            save_inventory(INVENTORY_FILE, self.inventory)
+
+    def _rebuild_inventory_indices(self):
+        """
+        Recompute the per-position inventory views: the set of positions
+        with a positive quantity plus the qty/sell arrays parallel to
+        market_data, so hot loops index by position instead of hashing
+        keys. Called after a data load or bulk inventory change (import);
+        single-cell edits keep all three updated incrementally.
+        """
+        self.inventory_indices = {
+            self.key_to_index[k]
+            for k in self.inventory
+            if k in self.key_to_index and self.get_qty(k) > 0
+        }
+        qty_cache = self._qty_cache
+        sell_cache = self._sell_cache
+        self.qty_by_pos = [qty_cache.get(k, 0.0) for k in self.item_keys]
+        self.sell_by_pos = [sell_cache.get(k, "") for k in self.item_keys]
+        self._invalidate_filter_cache()
+
+    def _invalidate_filter_cache(self):
+        """
+        Drop the cached last filter result used for search refinement.
+        Must be called whenever the underlying candidate set can change
+        (inventory edits, imports, data reloads).
+        """
+        self._last_filter = None
 
     # ---------------- FILTERING + SEARCH ----------------
     def apply_filters(self):
@@ -886,48 +1608,99 @@ class AnnexWindow(QMainWindow):
         Then alphabetize result by item_name.
         """
         if not self.market_data:
-            self.filtered_data = []
+            self.filtered_indices = []
             self.populate_table()
             return
 
         raw = self.search_edit.text().strip()
-        keywords = [k.lower() for k in raw.replace(",", " ").split() if k.strip()]
+        keywords = [
+            fold_search_text(k) for k in raw.replace(",", " ").split() if k.strip()
+        ]
+        # Dedupe (order-preserving) so repeated tokens don't bloat the
+        # pattern or fragment the compile cache; one precompiled pattern
+        # then replaces the per-item keyword loop
+        keywords = list(dict.fromkeys(keywords))
+        search = compile_search_pattern(tuple(keywords)).search if keywords else None
         filter_mode = self.filter_combo.currentIndex()  # 0 = all, 1 = inventory
 
         cat_filter = self.category_combo.currentData()
         subcat_filter = self.subcategory_combo.currentData()
 
-        filtered = []
-
-        for item in self.market_data:
-            name = (item.get("item_name") or "").lower()
-
-            # Partial-name search: match if ANY keyword appears in name.
-            if keywords and not any(k in name for k in keywords):
-                continue
-
-            # Inventory filter
-            key = self.item_key(item)
-            qty = self.get_qty(key)
-
-            if filter_mode == 1 and qty <= 0:
-                # Inventory only
-                continue
-
-            # Category / Subcategory filters
-            section = (item.get("category_section") or "").strip()
-            subname = (item.get("category_name") or "").strip()
-
-            if cat_filter is not None and section != cat_filter:
-                continue
-            if subcat_filter is not None and subname != subcat_filter:
-                continue
+        # Same state as the last pass and nothing has invalidated the
+        # cache since: the view is already showing this exact result
+        # (e.g. the signal-blocking dance in go_home, or a combo change
+        # re-selecting the current entry).
+        last = self._last_filter
+        if (
+            last is not None
+            and keywords == last[0]
+            and filter_mode == last[1]
+            and cat_filter == last[2]
+            and subcat_filter == last[3]
+        ):
+            return
 
-            filtered.append(item)
+        # Inventory mode only needs to look at owned items, which is usually
+        # a tiny subset of the full market list.
+        if filter_mode == 1:
+            candidates = self.inventory_indices
+        else:
+            candidates = range(len(self.market_data))
 
-        # Default order: alphabetize by item name
-        filtered.sort(key=lambda it: (it.get("item_name") or "").lower())
-        self.filtered_data = filtered
+        # Category filters are precomputed position sets (built in
+        # populate_category_filters), so applying one is a set
+        # intersection instead of a string compare per item.
+        if cat_filter is not None or subcat_filter is not None:
+            allowed = None
+            if cat_filter is not None:
+                allowed = self._section_positions.get(cat_filter, set())
+            if subcat_filter is not None:
+                sub = self._subcat_positions.get(subcat_filter, set())
+                allowed = sub if allowed is None else allowed & sub
+            if filter_mode == 1:
+                candidates = candidates & allowed
+            else:
+                candidates = allowed
+
+        # Refinement reuse: while typing, each keystroke usually extends the
+        # previous token. If only the search narrowed (same mode and category
+        # combo, and every new token contains one of the old ones), the new
+        # result is a subset of the last one, so rescan that instead of the
+        # full candidate set. _invalidate_filter_cache drops this on
+        # inventory edits, imports and data reloads.
+        last = self._last_filter
+        if (
+            last is not None
+            and keywords
+            and filter_mode == last[1]
+            and cat_filter == last[2]
+            and subcat_filter == last[3]
+            and (not last[0] or all(any(ok in nk for ok in last[0]) for nk in keywords))
+        ):
+            candidates = last[4]
+
+        # The candidate set already satisfies the mode and category
+        # filters, so only the partial-name search remains per item.
+        # Bind the corpus to a local: the loop body then costs plain
+        # list indexing instead of attribute lookups per item.
+        names_lower = self.item_names_lower
+
+        if search is None:
+            filtered = list(candidates)
+        else:
+            filtered = []
+            append = filtered.append
+            for i in candidates:
+                # Partial-name search: match if ANY keyword appears in name.
+                if search(names_lower[i]) is not None:
+                    append(i)
+
+        # Default order: alphabetize by item name via the precomputed
+        # ranks (int comparisons, and a bound method instead of a
+        # Python-level lambda call per element)
+        filtered.sort(key=self.name_rank.__getitem__)
+        self.filtered_indices = filtered
+        self._last_filter = (keywords, filter_mode, cat_filter, subcat_filter, filtered)
 
         # Status text
         parts = []
@@ -940,10 +1713,10 @@ class AnnexWindow(QMainWindow):
 
         if parts:
             self.status_label.setText(
-                f"Showing {len(self.filtered_data)} items ({', '.join(parts)})."
+                f"Showing {len(self.filtered_indices)} items ({', '.join(parts)})."
             )
         else:
-            self.status_label.setText(f"Showing {len(self.filtered_data)} items.")
+            self.status_label.setText(f"Showing {len(self.filtered_indices)} items.")
 
         self.populate_table()
 
@@ -972,297 +1745,182 @@ class AnnexWindow(QMainWindow):
         self.category_combo.blockSignals(False)
         self.subcategory_combo.blockSignals(False)
 
-        # Apply filters once with the "home" state
+        # Apply filters once with the "home" state; cancel any pending
+        # debounced run so the stale search text can't fire after this
+        self._search_timer.stop()
         self.apply_filters()
 
     # ---------------- TABLE POPULATION ----------------
     def populate_table(self):
-        # Guard so on_item_changed ignores any signals triggered here
-        self.updating_table = True
-
-        # Temporarily disable sorting and block itemChanged while we repopulate rows
-        sorting_was_enabled = self.table.isSortingEnabled()
-        self.table.setSortingEnabled(False)
-        self.table.blockSignals(True)
-
-        self.table.clearContents()
-        self.table.setRowCount(len(self.filtered_data))
-
-        for row, item in enumerate(self.filtered_data):
-            key = self.item_key(item)
-            unit_price = self.get_unit_price(item)
-            trend_arrow = item.get("trend_arrow", "→")
-
-            # Quantity (from inventory or 0)
-            qty_float = self.get_qty(key)
-
-            # --- Qty display with reduced resolution (e.g. 17.0 -> 17, 0 -> "") ---
-            if qty_float == 0:
-                qty_display = ""
-            elif float(qty_float).is_integer():
-                qty_display = str(int(qty_float))
-            else:
-                qty_display = str(qty_float)
-
-            # Qty (numeric-sort)
-            qty_item = NumericTableWidgetItem(qty_display)
-            qty_item.setTextAlignment(Qt.AlignCenter)
-            # Store key in user data so we can find this row even after sorting
-            qty_item.setData(Qt.UserRole, key)
-            self.table.setItem(row, 0, qty_item)
-
-            # Item name (string-sort)
-            name = item.get("item_name") or f"Item {item.get('id_item')}"
-            name_item = NumericTableWidgetItem(name)
-            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 1, name_item)
-
-            # Listed price (numeric-sort, read-only)
-            price_text = f"{unit_price:,.0f}"
-            price_item = NumericTableWidgetItem(price_text)
-            price_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            price_item.setFlags(price_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 2, price_item)
-
-            # Trend arrow (read-only, colored)
-            trend_item = QTableWidgetItem(trend_arrow)
-            trend_item.setTextAlignment(Qt.AlignCenter)
-            trend_item.setFlags(trend_item.flags() & ~Qt.ItemIsEditable)
-
-            # Color arrows: green up, red down, default for →
-            if trend_arrow == "▲":
-                trend_item.setForeground(QBrush(QColor(0, 200, 0)))   # green
-            elif trend_arrow == "▼":
-                trend_item.setForeground(QBrush(QColor(200, 0, 0)))   # red
-
-            self.table.setItem(row, 3, trend_item)
-
-            # Sell price (numeric-sort, EDITABLE) — loaded from inventory if present
-            sell_val = self.get_sell_price_for_key(key)
-
-            if isinstance(sell_val, (int, float)):
-                # For money: blank if 0 or negative, otherwise format with commas
-                if sell_val <= 0:
-                    sell_display = ""
-                else:
-                    sell_display = f"{sell_val:,.0f}"
-            else:
-                # Non-numeric or empty value
-                if sell_val in ("", None):
-                    sell_display = ""
-                else:
-                    sell_display = str(sell_val)
-
-            sell_item = NumericTableWidgetItem(sell_display)
-            sell_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.table.setItem(row, 4, sell_item)
-
-            # Line total (numeric-sort, read-only) based on listed price * qty
-            line_total = qty_float * unit_price
-            line_text = f"{line_total:,.0f}" if line_total else ""
-            line_item = NumericTableWidgetItem(line_text)
-            line_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            line_item.setFlags(line_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 5, line_item)
-
-        # Re-enable signals and restore sorting state
-        self.table.blockSignals(False)
-        self.table.setSortingEnabled(sorting_was_enabled)
-
-        self.updating_table = False
+        # The model reads straight from filtered_indices; just tell the
+        # view the row set changed. Suspend painting so the swap costs a
+        # single repaint instead of one per row.
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.model.refresh()
+        finally:
+            self.table.setUpdatesEnabled(True)
         self.update_grand_total()
 
-    # ---------------- TABLE CHANGE HANDLING ----------------
-    def on_item_changed(self, item):
-        if self.updating_table:
-            return
-
-        row = item.row()
-        col = item.column()
-
-        if row < 0 or row >= self.table.rowCount():
-            return
-
-        # We always use the Qty cell to recover the key
-        qty_item = self.table.item(row, 0)
-        if qty_item is None:
-            return
-        key = qty_item.data(Qt.UserRole)
-        if not key:
-            return
-
-        # ----- Qty changed -----
-        if col == 0:
-            text = item.text().replace(",", "").strip()
-            try:
-                qty = float(text) if text else 0.0
-            except ValueError:
-                qty = 0.0
+    # ---------------- INVENTORY EDITS (called from InventoryModel.setData) ----------------
+    def set_qty_from_text(self, key, text):
+        """
+        Parse an edited Qty cell and update the inventory record for key.
+        Persists the inventory and keeps inventory_indices in sync.
+        """
+        text = text.replace(",", "").strip()
+        try:
+            qty = float(text) if text else 0.0
+        except ValueError:
+            qty = 0.0
 
-            # Read existing record if present
-            rec = self.inventory.get(key)
-            if isinstance(rec, dict):
-                rec = dict(rec)  # shallow copy
-            else:
-                rec = {}
+        # Mutate the stored record in place: _normalize_inventory
+        # guarantees records are dicts and nothing else aliases them,
+        # so no defensive copy is needed per edit.
+        rec = self.inventory.get(key)
+        if rec is None:
+            rec = {}
 
-            rec["qty"] = qty
+        rec["qty"] = qty
 
-            if qty == 0:
-                # If qty is zero and no sell_price is stored, remove the entry
-                if "sell_price" not in rec or rec["sell_price"] in ("", None):
-                    self.inventory.pop(key, None)
-                else:
-                    # Keep entry with qty=0 because sell_price is still meaningful
-                    self.inventory[key] = rec
+        if qty == 0:
+            # If qty is zero and no sell_price is stored, remove the entry
+            if "sell_price" not in rec or rec["sell_price"] in ("", None):
+                self.inventory.pop(key, None)
             else:
+                # Keep entry with qty=0 because sell_price is still meaningful
                 self.inventory[key] = rec
+        else:
+            self.inventory[key] = rec
 
-            save_inventory(INVENTORY_FILE, self.inventory)
-
-            # Recalc this row + both totals
-            self.recalculate_row(row)
-            self.update_grand_total()
-            self.update_overall_total()
-            return
-
-        # ----- Sell Price changed -----
-        if col == 4:
-            # Raw text, but strip commas for numeric parsing
-            raw_text = item.text()
-            text = raw_text.replace(",", "").strip()
-
-            # Read existing record
-            rec = self.inventory.get(key)
-            if isinstance(rec, dict):
-                rec = dict(rec)
-            else:
-                # If we had old-style numeric qty only, convert it
-                rec = {"qty": self.get_qty(key)}
-
-            display_text = ""
+        self._mark_inventory_dirty()
 
-            if not text:
-                # User cleared the field: remove sell_price
-                rec.pop("sell_price", None)
-            else:
-                # Try numeric; if fails, treat as free-form string
-                try:
-                    sp = float(text)
-                    # For money: if 0 or negative, treat as empty / no sell price
-                    if sp <= 0:
-                        rec.pop("sell_price", None)
-                        display_text = ""
-                    else:
-                        rec["sell_price"] = sp
-                        # Format with thousands separators, no decimals
-                        display_text = f"{sp:,.0f}"
-                except ValueError:
-                    # Non-numeric input: store and display as-is
-                    rec["sell_price"] = raw_text
-                    display_text = raw_text
-
-            # If qty == 0 and no sell_price, remove entry entirely
-            qty_val = rec.get("qty", 0)
-            try:
-                qty_val = float(qty_val)
-            except (TypeError, ValueError):
-                qty_val = 0.0
+        # Keep the flat qty cache and inventory-filter index in sync
+        if qty:
+            self._qty_cache[key] = qty
+        else:
+            self._qty_cache.pop(key, None)
 
-            if qty_val == 0 and "sell_price" not in rec:
-                self.inventory.pop(key, None)
+        idx = self.key_to_index.get(key)
+        if idx is not None:
+            self.qty_by_pos[idx] = qty
+            if qty > 0:
+                self.inventory_indices.add(idx)
             else:
-                self.inventory[key] = rec
+                self.inventory_indices.discard(idx)
+        self._invalidate_filter_cache()
 
-            save_inventory(INVENTORY_FILE, self.inventory)
+        return qty
 
-            # Re-format the cell text to match our display rules
-            self.updating_table = True
-            item.setText(display_text)
-            self.updating_table = False
-
-            # Sell total depends on sell price, so recalc it
-            self.update_grand_total()
-            return
-
-    def recalculate_row(self, row):
+    def set_sell_price_from_text(self, key, raw_text):
         """
-        Recalculate line total for the given row based on Qty and Listed Price.
-        Also normalizes Qty display so 17.0 -> 17, 0 -> "".
+        Parse an edited Sell Price cell and update the inventory record.
+        Numeric values are stored as float; non-numeric input is kept
+        as a free-form string (displayed as-is).
         """
-        self.updating_table = True
+        text = raw_text.replace(",", "").strip()
 
-        qty_item = self.table.item(row, 0)
-        price_item = self.table.item(row, 2)  # Listed price column
-        line_item = self.table.item(row, 5)   # Line total column
+        # Mutate the stored record in place (always dict form after
+        # normalization; nothing else aliases it)
+        rec = self.inventory.get(key)
+        if rec is None:
+            rec = {"qty": self.get_qty(key)}
 
-        if qty_item is None or price_item is None or line_item is None:
-            self.updating_table = False
-            return
-
-        qty_text = qty_item.text().replace(",", "").strip()
-        price_text = price_item.text().replace(",", "").strip()
+        if not text:
+            # User cleared the field: remove sell_price
+            rec.pop("sell_price", None)
+        else:
+            # Try numeric; if fails, treat as free-form string
+            try:
+                sp = float(text)
+                # For money: if 0 or negative, treat as empty / no sell price
+                if sp <= 0:
+                    rec.pop("sell_price", None)
+                else:
+                    rec["sell_price"] = sp
+            except ValueError:
+                # Non-numeric input: store and display as-is
+                rec["sell_price"] = raw_text
 
+        # If qty == 0 and no sell_price, remove entry entirely
+        qty_val = rec.get("qty", 0)
         try:
-            qty = float(qty_text) if qty_text else 0.0
-        except ValueError:
-            qty = 0.0
+            qty_val = float(qty_val)
+        except (TypeError, ValueError):
+            qty_val = 0.0
 
-        try:
-            price = float(price_text) if price_text else 0.0
-        except ValueError:
-            price = 0.0
+        if qty_val == 0 and "sell_price" not in rec:
+            self.inventory.pop(key, None)
+        else:
+            self.inventory[key] = rec
 
-        # Normalize qty display
-        if qty == 0:
-            qty_display = ""
-        elif float(qty).is_integer():
-            qty_display = str(int(qty))
+        # Keep the flat sell-price cache and position array in sync
+        if "sell_price" in rec and key in self.inventory:
+            sell_val = rec["sell_price"]
+            self._sell_cache[key] = sell_val
         else:
-            qty_display = str(qty)
-        qty_item.setText(qty_display)
+            sell_val = ""
+            self._sell_cache.pop(key, None)
 
-        # Line total (still based on listed price)
-        line_total = qty * price
-        line_item.setText(f"{line_total:,.0f}" if line_total else "")
+        idx = self.key_to_index.get(key)
+        if idx is not None:
+            self.sell_by_pos[idx] = sell_val
 
-        self.updating_table = False
+        self._mark_inventory_dirty()
+
+    def _mark_inventory_dirty(self):
+        """
+        Note an in-memory inventory change and (re)start the flush timer.
+        """
+        self._inventory_dirty = True
+        self._flush_timer.start()
+
+    def _flush_inventory(self):
+        """
+        Hand unsaved inventory changes to a background writer. The GUI
+        thread only snapshots the records; serialization and the atomic
+        file replace run on a pool thread.
+        """
+        if self._inventory_dirty:
+            snapshot = {k: dict(v) for k, v in self.inventory.items()}
+            QThreadPool.globalInstance().start(InventorySaveTask(snapshot))
+            self._inventory_dirty = False
+
+    def closeEvent(self, event):
+        # Don't lose a debounced save that hasn't fired yet. Wait out any
+        # in-flight background write first so it can't land after (and
+        # clobber) the final synchronous save.
+        self._flush_timer.stop()
+        QThreadPool.globalInstance().waitForDone(2000)
+        if self._inventory_dirty:
+            save_inventory(INVENTORY_FILE, self.inventory)
+            self._inventory_dirty = False
+        super().closeEvent(event)
 
     # ---------------- TOTALS ----------------
     def update_grand_total(self):
         """
-        Sell total of currently visible rows in the table (respects search/filter).
-        Uses Qty * Sell Price (column 0 * column 4) for each row.
-        Rows with blank/non-numeric/zero sell price are ignored.
+        Sell total of currently visible rows (respects search/filter).
+        Uses Qty * Sell Price per row; rows with blank/non-numeric/zero
+        sell price are ignored.
         """
         total = 0.0
-        rows = self.table.rowCount()
-
-        for row in range(rows):
-            qty_item = self.table.item(row, 0)   # Qty
-            sell_item = self.table.item(row, 4)  # Sell Price
-            if not qty_item or not sell_item:
-                continue
+        qty_by_pos = self.qty_by_pos
+        sell_by_pos = self.sell_by_pos
 
-            qty_text = qty_item.text().replace(",", "").strip()
-            sell_text = sell_item.text().replace(",", "").strip()
-
-            if not qty_text or not sell_text:
+        for i in self.filtered_indices:
+            qty = qty_by_pos[i]
+            if qty <= 0:
                 continue
 
-            try:
-                qty = float(qty_text)
-                sell_price = float(sell_text)
-            except ValueError:
+            sell_price = sell_by_pos[i]
+            if not isinstance(sell_price, (int, float)) or sell_price <= 0:
                 # Non-numeric sell price (e.g., string labels) are ignored
                 continue
 
-            if qty <= 0 or sell_price <= 0:
-                continue
-
             total += qty * sell_price
 
-        self.total_label.setText(f"{total:,.0f}")
+        self.total_label.setText(fmt_money(total))
 
     def update_overall_total(self):
         """
@@ -1270,21 +1928,21 @@ class AnnexWindow(QMainWindow):
         sum over ALL items (market_data) of qty * listed_price,
         using saved inventory quantities (even if not currently visible).
         """
-        total = 0.0
         if not self.market_data:
             self.overall_total_label.setText("0")
             return
 
-        for item in self.market_data:
-            key = self.item_key(item)
-            qty = self.get_qty(key)
-            if qty <= 0:
-                continue
-
-            price = self.get_unit_price(item)
-            total += qty * price
+        # Only owned items contribute, so iterate inventory_indices and
+        # read quantities/prices from the flat caches — O(owned items)
+        # rather than a pass over the whole market list.
+        qty_by_pos = self.qty_by_pos
+        unit_prices = self.unit_prices
+        total = sum(
+            qty_by_pos[i] * unit_prices[i]
+            for i in self.inventory_indices
+        )
 
-        self.overall_total_label.setText(f"{total:,.0f}")
+        self.overall_total_label.setText(fmt_money(total))
 
     # ---------------- EXPORT INDEX (JSON, XLSX, TXT, PDF) ----------------
     def export_index(self):
@@ -1319,107 +1977,106 @@ class AnnexWindow(QMainWindow):
             )
             return
 
-        # Build records from full inventory
-        records = []
-        for item in self.market_data:
-            key = self.item_key(item)
-            qty = self.get_qty(key)
-            sell_price = self.get_sell_price_for_key(key)
+        # Build rows from full inventory as plain tuples:
+        # (qty, name, sell_value, category, subcategory). Every writer
+        # iterates these directly; only JSON needs keyed objects and
+        # builds them once below.
+        rows = []
+        for i, item in enumerate(self.market_data):
+            qty = self.qty_by_pos[i]
+            sell_price = self.sell_by_pos[i]
             # Skip completely empty entries
             if qty <= 0 and (sell_price in ("", None)):
                 continue
 
             name = item.get("item_name") or f"Item {item.get('id_item')}"
-            category = item.get("category_section") or ""
-            subcategory = item.get("category_name") or ""
-            records.append({
-                "QTY": qty,
-                "Item Name": name,
-                "Sell Value": sell_price if sell_price != "" else None,
-                "Category": category,
-                "Sub-Category": subcategory,
-            })
+            rows.append((
+                qty,
+                name,
+                sell_price if sell_price != "" else None,
+                self.cat_section[i],
+                self.cat_name[i],
+            ))
 
         try:
             if ext == ".json":
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(records, f, indent=2)
+                records = [
+                    {
+                        "QTY": qty,
+                        "Item Name": name,
+                        "Sell Value": sell_value,
+                        "Category": category,
+                        "Sub-Category": subcategory,
+                    }
+                    for qty, name, sell_value, category, subcategory in rows
+                ]
+                with open(file_path, "wb") as f:
+                    f.write(json_dumps(records))
 
             elif ext == ".xlsx":
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "Index"
-                ws.append(["QTY", "Item Name", "Sell Value", "Category", "Sub-Category"])
-                for rec in records:
-                    ws.append([
-                        rec.get("QTY", 0),
-                        rec.get("Item Name", ""),
-                        rec.get("Sell Value", None),
-                        rec.get("Category", ""),
-                        rec.get("Sub-Category", ""),
-                    ])
+                # Write-only mode streams rows straight to the zip instead of
+                # keeping every Cell object in memory — matters for full dumps.
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet("Index")
+
+                # One shared Font for the whole header row (not one per cell)
+                header_font = Font(bold=True)
+                header_cells = []
+                for h in ("QTY", "Item Name", "Sell Value", "Category", "Sub-Category"):
+                    cell = WriteOnlyCell(ws, value=h)
+                    cell.font = header_font
+                    header_cells.append(cell)
+                ws.append(header_cells)
+
+                for row in rows:
+                    ws.append(row)
                 wb.save(file_path)
 
             elif ext == ".txt":
                 # Simple tab-separated text
                 lines = ["QTY\tItem Name\tSell Value\tCategory\tSub-Category"]
-                for rec in records:
-                    qty = rec.get("QTY", 0)
-                    name = rec.get("Item Name", "")
-                    val = rec.get("Sell Value", "")
-                    cat = rec.get("Category", "")
-                    sub = rec.get("Sub-Category", "")
+                for row in rows:
+                    qty, name, val, cat, sub = row
+                    if val is None:
+                        val = ""
                     lines.append(f"{qty}\t{name}\t{val}\t{cat}\t{sub}")
                 with open(file_path, "w", encoding="utf-8") as f:
                     f.write("\n".join(lines))
 
             elif ext == ".pdf":
-                # Build a simple HTML table and print to PDF
-                html_rows = [
-                    "<tr>"
-                    "<th>QTY</th>"
-                    "<th>Item Name</th>"
-                    "<th>Sell Value</th>"
-                    "<th>Category</th>"
-                    "<th>Sub-Category</th>"
-                    "</tr>"
-                ]
-                for rec in records:
-                    qty = rec.get("QTY", 0)
-                    name = rec.get("Item Name", "")
-                    val = rec.get("Sell Value", "")
-                    cat = rec.get("Category", "")
-                    sub = rec.get("Sub-Category", "")
-                    # Nicely format numeric sell values
-                    if isinstance(val, (int, float)):
-                        val_str = f"{val:,.0f}"
-                    else:
-                        val_str = "" if val is None else str(val)
-                    html_rows.append(
-                        "<tr>"
-                        f"<td>{qty}</td>"
-                        f"<td>{name}</td>"
-                        f"<td>{val_str}</td>"
-                        f"<td>{cat}</td>"
-                        f"<td>{sub}</td>"
-                        "</tr>"
-                    )
-
-                html = (
-                    "<html><head><meta charset='utf-8'></head><body>"
-                    "<h2>Inventory Index</h2>"
-                    "<table border='1' cellspacing='0' cellpadding='3'>"
-                    + "".join(html_rows) +
-                    "</table>"
-                    "</body></html>"
-                )
-
+                # Insert rows straight into the document via a cursor:
+                # no giant HTML string to build, escape or re-parse
                 printer = QPrinter(QPrinter.HighResolution)
                 printer.setOutputFormat(QPrinter.PdfFormat)
                 printer.setOutputFileName(file_path)
 
                 doc = QTextDocument()
-                doc.setHtml(html)
+                cursor = QTextCursor(doc)
+                cursor.insertHtml("<h2>Inventory Index</h2>")
+                cursor.movePosition(QTextCursor.End)
+
+                table_fmt = QTextTableFormat()
+                table_fmt.setBorder(1)
+                table_fmt.setCellSpacing(0)
+                table_fmt.setCellPadding(3)
+                cursor.insertTable(len(rows) + 1, 5, table_fmt)
+
+                for header in ("QTY", "Item Name", "Sell Value",
+                               "Category", "Sub-Category"):
+                    cursor.insertText(header)
+                    cursor.movePosition(QTextCursor.NextCell)
+
+                for qty, name, val, cat, sub in rows:
+                    # Nicely format numeric sell values
+                    if isinstance(val, (int, float)):
+                        val_str = fmt_money(val)
+                    else:
+                        val_str = "" if val is None else str(val)
+                    for text in (str(qty), str(name), val_str,
+                                 str(cat), str(sub)):
+                        cursor.insertText(text)
+                        cursor.movePosition(QTextCursor.NextCell)
+
                 doc.print_(printer)
 
             QMessageBox.information(
@@ -1441,8 +2098,9 @@ class AnnexWindow(QMainWindow):
         Import index data from JSON or XLSX with fields:
         QTY, Item Name, Sell Value
 
-        Matches items by Item Name to current market_data.
-        Updates self.inventory and persists to INVENTORY_FILE.
+        File parsing and name matching run on an ImportThread; the
+        merge into self.inventory happens back on the GUI thread in
+        _on_import_parsed.
         """
         file_path, selected_filter = QFileDialog.getOpenFileName(
             self,
@@ -1455,180 +2113,87 @@ class AnnexWindow(QMainWindow):
 
         root, ext = os.path.splitext(file_path)
         ext = ext.lower()
+        if ext not in (".json", ".xlsx"):
+            QMessageBox.warning(
+                self,
+                "Unsupported Format",
+                "Unsupported file type. Use .json or .xlsx"
+            )
+            return
 
         QApplication.setOverrideCursor(Qt.WaitCursor)
         self.status_label.setText("Importing index…")
-        QApplication.processEvents()
-
-        try:
-            # Build quick lookup: item_name -> item dict
-            name_map = {}
-            for item in self.market_data:
-                nm = item.get("item_name")
-                if nm:
-                    name_map[nm] = item
-
-            records = []
-
-            if ext == ".json":
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if not isinstance(data, list):
-                    raise ValueError("JSON must be a list of objects.")
-                # Normalize JSON records
-                for rec in data:
-                    if not isinstance(rec, dict):
-                        continue
-                    # Flexible key matching
-                    name = (
-                        rec.get("Item Name")
-                        or rec.get("item_name")
-                        or rec.get("name")
-                    )
-                    qty = (
-                        rec.get("QTY")
-                        if "QTY" in rec else rec.get("qty", 0)
-                    )
-                    sell_val = (
-                        rec.get("Sell Value")
-                        if "Sell Value" in rec
-                        else rec.get("Sell Price", rec.get("sell_price"))
-                    )
-                    records.append({
-                        "Item Name": name,
-                        "QTY": qty,
-                        "Sell Value": sell_val,
-                    })
-
-            elif ext == ".xlsx":
-                wb = load_workbook(file_path, data_only=True)
-                ws = wb.active
-
-                # Read header row and map columns
-                header_map = {}
-                first = True
-                for row in ws.iter_rows(values_only=True):
-                    if first:
-                        first = False
-                        if not row:
-                            continue
-                        for idx, val in enumerate(row):
-                            if not val:
-                                continue
-                            key = str(val).strip().lower()
-                            header_map[key] = idx
-                        continue
 
-                    if not row:
-                        continue
+        self._import_thread = ImportThread(
+            file_path, ext, self.name_to_index, self.item_keys, self
+        )
+        self._import_thread.parsed.connect(self._on_import_parsed)
+        self._import_thread.failed.connect(self._on_import_failed)
+        self._import_thread.start()
 
-                    def get_col(*names):
-                        for n in names:
-                            idx = header_map.get(n)
-                            if idx is not None and idx < len(row):
-                                return row[idx]
-                        return None
+    def _on_import_parsed(self, matched, not_found):
+        """
+        Merge the worker's matched (key, qty, sell_price) tuples into the
+        inventory, persist, and refresh the UI. Runs on the GUI thread.
+        """
+        QApplication.restoreOverrideCursor()
 
-                    name = get_col("item name", "name")
-                    qty = get_col("qty", "quantity")
-                    sell_val = get_col("sell value", "sell price")
+        for key, qty_val, sell_val in matched:
+            # Start with existing record if any (mutated in place;
+            # _normalize_inventory rebuilds the flat caches after the
+            # merge loop)
+            inv_entry = self.inventory.get(key)
+            if not isinstance(inv_entry, dict):
+                inv_entry = {}
 
-                    records.append({
-                        "Item Name": name,
-                        "QTY": qty,
-                        "Sell Value": sell_val,
-                    })
+            inv_entry["qty"] = qty_val
 
+            if sell_val is None:
+                inv_entry.pop("sell_price", None)
             else:
-                raise ValueError("Unsupported file type. Use .json or .xlsx")
-
-            not_found = []
-
-            for idx, rec in enumerate(records):
-                if not isinstance(rec, dict):
-                    continue
+                inv_entry["sell_price"] = sell_val
 
-                if idx % 500 == 0:
-                    QApplication.processEvents()
-
-                name = rec.get("Item Name")
-                if not name:
-                    continue
-
-                item = name_map.get(name)
-                if not item:
-                    not_found.append(name)
-                    continue
-
-                key = self.item_key(item)
-
-                qty_raw = rec.get("QTY", 0)
-                sell_value_raw = rec.get("Sell Value")
-
-                # Parse qty
-                try:
-                    qty_val = float(qty_raw) if qty_raw is not None else 0.0
-                except (TypeError, ValueError):
-                    qty_val = 0.0
-
-                # Start with existing record if any
-                inv_entry = self.inventory.get(key)
-                if isinstance(inv_entry, dict):
-                    inv_entry = dict(inv_entry)
-                else:
-                    inv_entry = {}
-
-                inv_entry["qty"] = qty_val
-
-                # Parse sell_value -> stored as sell_price
-                if sell_value_raw in (None, ""):
-                    inv_entry.pop("sell_price", None)
-                else:
-                    try:
-                        inv_entry["sell_price"] = float(sell_value_raw)
-                    except (TypeError, ValueError):
-                        inv_entry["sell_price"] = sell_value_raw
-
-                # If both qty and sell_price are effectively empty, remove
-                if qty_val == 0 and "sell_price" not in inv_entry:
-                    self.inventory.pop(key, None)
-                else:
-                    self.inventory[key] = inv_entry
-
-            # Persist to live inventory file
-            save_inventory(INVENTORY_FILE, self.inventory)
-
-            # Refresh UI
-            self.apply_filters()
-            self.update_overall_total()
-
-            if not_found:
-                skipped_list = "\n- ".join(sorted(set(not_found)))
-                msg = (
-                    "Import complete.\n\n"
-                    "The following items from the file were not found in "
-                    "the current market data and were skipped:\n"
-                    f"- {skipped_list}"
-                )
+            # If both qty and sell_price are effectively empty, remove
+            if qty_val == 0 and "sell_price" not in inv_entry:
+                self.inventory.pop(key, None)
             else:
-                msg = "Import complete."
+                self.inventory[key] = inv_entry
 
-            self.status_label.setText("Import complete.")
-            QMessageBox.information(
-                self,
-                "Import Index",
-                msg
-            )
+        # Persist to live inventory file
+        save_inventory(INVENTORY_FILE, self.inventory)
 
-        except Exception as e:
-            self.status_label.setText("Import failed.")
-            QMessageBox.critical(
-                self,
-                "Import Failed",
-                f"Failed to import index:\n{e}"
+        # Refresh UI (re-normalize so the flat caches cover the import)
+        self._normalize_inventory()
+        self._rebuild_inventory_indices()
+        self.apply_filters()
+        self.update_overall_total()
+
+        if not_found:
+            skipped_list = "\n- ".join(sorted(set(not_found)))
+            msg = (
+                "Import complete.\n\n"
+                "The following items from the file were not found in "
+                "the current market data and were skipped:\n"
+                f"- {skipped_list}"
             )
-        finally:
-            QApplication.restoreOverrideCursor()
+        else:
+            msg = "Import complete."
+
+        self.status_label.setText("Import complete.")
+        QMessageBox.information(
+            self,
+            "Import Index",
+            msg
+        )
+
+    def _on_import_failed(self, message):
+        QApplication.restoreOverrideCursor()
+        self.status_label.setText("Import failed.")
+        QMessageBox.critical(
+            self,
+            "Import Failed",
+            f"Failed to import index:\n{message}"
+        )
 
     # ------------------------------------------------------------
 